@@ -10,16 +10,29 @@ Usage:
 """
 
 import argparse
+import itertools
+import json
 import logging
+import multiprocessing
 import os
+import shutil
 import subprocess
 import sys
-from datetime import datetime, timedelta
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-import xarray as xr
+import eccodes
+import netCDF4
+import numpy as np
+import requests
 from ecmwf.opendata import Client
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # Configure logging
@@ -29,33 +42,470 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Buffer size for the in-process copy fallback
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Seconds between checks for new messages while streaming GRIB output
+STREAM_POLL_INTERVAL = 5.0
+
+
+def _fadvise(f, advice: str) -> None:
+    """Give the kernel an access pattern hint (e.g. "POSIX_FADV_SEQUENTIAL") for an open file."""
+    if hasattr(os, "posix_fadvise") and hasattr(os, advice):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice))
+        except OSError:
+            # Hints are best effort; some filesystems reject them
+            pass
+
+
+def _append_file(src, dst) -> None:
+    """Append the contents of an open binary file to another, in kernel space where possible."""
+    size = os.fstat(src.fileno()).st_size
+    offset = 0
+    dst.flush()
+    _fadvise(src, "POSIX_FADV_SEQUENTIAL")
+    try:
+        while offset < size:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    except (AttributeError, OSError):
+        # sendfile is unavailable on this platform or filesystem
+        src.seek(offset)
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+    # The source is not read again, so don't let it crowd the page cache
+    _fadvise(src, "POSIX_FADV_DONTNEED")
+
+
+def _int16_packing(vmin: float, vmax: float) -> dict:
+    """Return CF scale/offset encoding mapping [vmin, vmax] onto the int16 range."""
+    scale = (vmax - vmin) / 65534
+    if not np.isfinite(scale) or scale <= 0:
+        # Constant or empty field: any scale works
+        scale = 1.0
+        vmin = vmin if np.isfinite(vmin) else 0.0
+    return {
+        "scale_factor": scale,
+        "add_offset": vmin + 32767 * scale,
+        "_FillValue": np.int16(-32768),
+    }
+
+
+def _round_to_bfloat16(values: np.ndarray) -> np.ndarray:
+    """Round float32 values to bfloat16 precision, keeping float32 storage."""
+    bits = np.ascontiguousarray(values, dtype=np.float32).view(np.uint32)
+    # Round to nearest even on the 16 bits being dropped
+    bits = (bits + np.uint32(0x7FFF) + ((bits >> 16) & np.uint32(1))) & np.uint32(0xFFFF0000)
+    return bits.view(np.float32)
+
+
+def _iter_grib_messages(path: Path, done, poll_interval: float = STREAM_POLL_INTERVAL):
+    """
+    Yield eccodes handles from a GRIB file that may still be growing.
+    
+    Incomplete trailing messages are retried on the next poll. Iteration
+    ends once ``done`` is set and no further complete messages remain.
+    The caller owns (and must release) each yielded handle.
+    """
+    offset = 0
+    while True:
+        # Check before scanning so messages written just before the flag are not missed
+        finished = done.is_set()
+        if path.exists():
+            with open(path, "rb") as f:
+                _fadvise(f, "POSIX_FADV_SEQUENTIAL")
+                f.seek(offset)
+                while True:
+                    try:
+                        handle = eccodes.codes_grib_new_from_file(f)
+                    except eccodes.CodesInternalError:
+                        # Message still being written
+                        handle = None
+                    if handle is None:
+                        break
+                    offset = f.tell()
+                    yield handle
+                if finished:
+                    _fadvise(f, "POSIX_FADV_DONTNEED")
+        if finished:
+            return
+        time.sleep(poll_interval)
+
+
+def _field_metadata(handle) -> dict:
+    """Read the NetCDF-relevant metadata of a GRIB message."""
+    attrs = {
+        "units": eccodes.codes_get(handle, "units"),
+        "long_name": eccodes.codes_get(handle, "name"),
+    }
+    standard_name = eccodes.codes_get(handle, "cfName")
+    if standard_name != "unknown":
+        attrs["standard_name"] = standard_name
+    
+    return {
+        "name": eccodes.codes_get(handle, "cfVarName"),
+        "pressure": eccodes.codes_get(handle, "typeOfLevel") == "isobaricInhPa",
+        "level": eccodes.codes_get(handle, "level", int),
+        "step": eccodes.codes_get(handle, "step", int),
+        "attrs": attrs,
+    }
+
+
+def _field_values(handle) -> np.ndarray:
+    """Decode the values of a GRIB message as float32, with missing (bitmap) points as NaN."""
+    values = eccodes.codes_get_values(handle).astype(np.float32)
+    if eccodes.codes_get(handle, "bitmapPresent"):
+        values[values == np.float32(eccodes.codes_get(handle, "missingValue", float))] = np.nan
+    return values
+
+
+def _pack_values(values: np.ndarray, packing: str) -> np.ndarray:
+    """Prepare decoded float32 values for writing with the given NetCDF packing."""
+    if packing == "bf16":
+        return _round_to_bfloat16(values)
+    if packing == "int16":
+        # Missing points are stored as _FillValue. NaN is never packed: masked points
+        # hold 0, and so does the fill value, which survives pickling from a worker
+        missing = np.isnan(values)
+        return np.ma.masked_array(np.where(missing, np.float32(0), values), mask=missing, fill_value=0)
+    return values
+
+
+def _grid_metadata(handle) -> dict:
+    """Read the grid coordinates and reference time of a GRIB message."""
+    ny = eccodes.codes_get(handle, "Nj")
+    nx = eccodes.codes_get(handle, "Ni")
+    return {
+        "latitudes": eccodes.codes_get_array(handle, "latitudes").reshape(ny, nx)[:, 0],
+        "longitudes": eccodes.codes_get_array(handle, "longitudes").reshape(ny, nx)[0, :],
+        "reference_time": datetime.strptime(
+            f"{eccodes.codes_get(handle, 'dataDate')}{eccodes.codes_get(handle, 'dataTime'):04d}",
+            "%Y%m%d%H%M"
+        ),
+    }
+
+
+def _scan_grib_fields(path: Path, with_range: bool = False) -> Tuple[dict, dict, List[int], List[int], List[dict]]:
+    """
+    Scan a complete GRIB file for its grid, variables, pressure levels and steps.
+    
+    Only message headers are read unless ``with_range`` is set, in which case
+    each variable's minimum and maximum are collected as ``meta["range"]``.
+    
+    Returns:
+        Tuple of (grid, variables, levels in descending order, steps in ascending
+        order, per-message metadata with the message byte ``offset``)
+    """
+    grid = None
+    variables = {}
+    levels = set()
+    steps = set()
+    messages = []
+    
+    with open(path, "rb") as f:
+        _fadvise(f, "POSIX_FADV_SEQUENTIAL")
+        while (handle := eccodes.codes_grib_new_from_file(f)) is not None:
+            try:
+                if grid is None:
+                    grid = _grid_metadata(handle)
+                meta = _field_metadata(handle)
+                meta["offset"] = eccodes.codes_get(handle, "offset", int)
+                messages.append(meta)
+                
+                variable = variables.setdefault(meta["name"], meta)
+                if meta["pressure"]:
+                    levels.add(meta["level"])
+                steps.add(meta["step"])
+                
+                if with_range:
+                    # Statistics exclude missing (bitmap) points, which become _FillValue
+                    vmin = eccodes.codes_get(handle, "min", float)
+                    vmax = eccodes.codes_get(handle, "max", float)
+                    if "range" in variable:
+                        vmin = min(vmin, variable["range"][0])
+                        vmax = max(vmax, variable["range"][1])
+                    variable["range"] = (vmin, vmax)
+            finally:
+                eccodes.codes_release(handle)
+    
+    if grid is None:
+        raise RuntimeError(f"No GRIB messages found in {path}")
+    
+    return grid, variables, sorted(levels, reverse=True), sorted(steps), messages
+
+
+def _decode_fields(path: Path, offsets: List[int], shape: Tuple[int, int], packing: str) -> np.ndarray:
+    """
+    Decode the GRIB messages at the given byte offsets into one float32 array.
+    
+    Runs in a worker process during conversion; returns an array of shape
+    ``(len(offsets),) + shape``.
+    """
+    values = np.empty((len(offsets),) + shape, dtype=np.float32)
+    with open(path, "rb") as f:
+        for i, offset in enumerate(offsets):
+            f.seek(offset)
+            handle = eccodes.codes_grib_new_from_file(f)
+            try:
+                values[i] = _field_values(handle).reshape(shape)
+            finally:
+                eccodes.codes_release(handle)
+    
+    return _pack_values(values, packing)
+
+
+def _create_netcdf(path: Path, grid: dict, variables: dict, levels: List[int],
+                   packing: str, attrs: dict, n_times: int):
+    """
+    Create the NetCDF output file for Aurora forecast fields.
+    
+    All dimensions are fixed. Uncompressed variables are stored contiguously,
+    so every write goes straight to its final place in the file.
+    
+    Args:
+        path: Output NetCDF path
+        grid: Grid coordinates and reference time, as from ``_grid_metadata``
+        variables: Field metadata by variable name, as from ``_field_metadata``
+        levels: Pressure levels (hPa) in output order
+        packing: One of ``ECMWFAuroraAutomation.PACKING_MODES``
+        attrs: Global attributes
+        n_times: Number of time steps
+        
+    Returns:
+        Open netCDF4.Dataset in write mode. Nothing is synced until it is closed.
+    """
+    ny = len(grid["latitudes"])
+    nx = len(grid["longitudes"])
+    
+    ds = netCDF4.Dataset(path, "w", format="NETCDF4")
+    # Every value gets written, so don't pre-fill variables with _FillValue
+    ds.set_fill_off()
+    ds.createDimension("time", n_times)
+    ds.createDimension("level", len(levels))
+    ds.createDimension("latitude", ny)
+    ds.createDimension("longitude", nx)
+    
+    time_var = ds.createVariable("time", "i4", ("time",))
+    time_var.setncatts({
+        "standard_name": "time",
+        "units": f"hours since {grid['reference_time']:%Y-%m-%d %H:%M:%S}",
+    })
+    
+    level_var = ds.createVariable("level", "i4", ("level",))
+    level_var.setncatts({"long_name": "pressure", "units": "hPa", "positive": "down"})
+    level_var[:] = levels
+    
+    lat_var = ds.createVariable("latitude", "f8", ("latitude",))
+    lat_var.setncatts({"standard_name": "latitude", "units": "degrees_north"})
+    lat_var[:] = grid["latitudes"]
+    
+    lon_var = ds.createVariable("longitude", "f8", ("longitude",))
+    lon_var.setncatts({"standard_name": "longitude", "units": "degrees_east"})
+    lon_var[:] = grid["longitudes"]
+    
+    for name, meta in variables.items():
+        if meta["pressure"]:
+            dims = ("time", "level", "latitude", "longitude")
+            chunksizes = (1, len(levels), ny, nx)
+        else:
+            dims = ("time", "latitude", "longitude")
+            chunksizes = (1, ny, nx)
+        
+        if packing == "bf16":
+            # Zeroed low mantissa bits of bf16 only save space once compressed,
+            # which needs a chunked layout
+            layout = {"zlib": True, "chunksizes": chunksizes}
+        else:
+            layout = {"contiguous": True}
+        
+        # Reserved attributes (e.g. _FillValue) are set through createVariable
+        var_attrs = {key: value for key, value in meta["attrs"].items() if not key.startswith("_")}
+        if packing == "int16":
+            encoding = _int16_packing(*meta["range"])
+            var = ds.createVariable(name, "i2", dims, fill_value=encoding["_FillValue"], **layout)
+            var_attrs["scale_factor"] = encoding["scale_factor"]
+            var_attrs["add_offset"] = encoding["add_offset"]
+        else:
+            var = ds.createVariable(name, "f4", dims, **layout)
+        
+        if packing == "bf16":
+            # Keep a whole chunk in cache so per-level writes never read back a
+            # partial chunk; each chunk is flushed once, when evicted or on close
+            chunk_bytes = int(np.prod(chunksizes)) * var.dtype.itemsize
+            var.set_var_chunk_cache(size=2 * chunk_bytes, preemption=1.0)
+        
+        var.setncatts(var_attrs)
+        
+        # Float values are written as plain arrays (missing points as NaN), so
+        # skip masked-array handling; int16 needs it to pack NaN as _FillValue
+        if packing != "int16":
+            var.set_auto_mask(False)
+    
+    ds.setncatts(attrs)
+    
+    return ds
+
+
+def _write_field(ds, handle, meta: dict, time_index: int, level_index: int, packing: str) -> None:
+    """Write the values of a GRIB message into its slot of the NetCDF output."""
+    var = ds[meta["name"]]
+    values = _pack_values(_field_values(handle).reshape(var.shape[-2:]), packing)
+    
+    if meta["pressure"]:
+        var[time_index, level_index, :, :] = values
+    else:
+        var[time_index, :, :] = values
+
+
+def _stream_to_netcdf(grib_path: Path, netcdf_path: Path, packing: str, attrs: dict,
+                      n_times: int, done) -> None:
+    """
+    Convert Aurora GRIB output to NetCDF while the forecast is still writing it.
+    
+    Entry point of the background conversion process. The messages of the
+    first step are buffered to learn the variables and levels; all later
+    messages are written as soon as they are complete. ``n_times`` is the
+    number of steps (including step 0) the file is sized for; since fill
+    values are not written, the conversion fails unless exactly that many
+    steps were converted.
+    """
+    if packing == "int16":
+        raise ValueError("int16 packing needs complete fields and cannot be streamed")
+    
+    first_step = []
+    levels = []
+    time_indices = {}
+    ds = None
+    
+    def write(handle, meta):
+        if meta["step"] not in time_indices:
+            time_indices[meta["step"]] = len(time_indices)
+            ds["time"][time_indices[meta["step"]]] = meta["step"]
+        level_index = levels.index(meta["level"]) if meta["pressure"] else 0
+        try:
+            _write_field(ds, handle, meta, time_indices[meta["step"]], level_index, packing)
+        finally:
+            eccodes.codes_release(handle)
+    
+    def flush_first_step():
+        nonlocal ds
+        variables = {meta["name"]: meta for _, meta in first_step}
+        levels.extend(sorted({meta["level"] for _, meta in first_step if meta["pressure"]}, reverse=True))
+        ds = _create_netcdf(netcdf_path, _grid_metadata(first_step[0][0]), variables, levels,
+                            packing, attrs, n_times)
+        while first_step:
+            write(*first_step.pop(0))
+    
+    try:
+        for handle in _iter_grib_messages(grib_path, done):
+            meta = _field_metadata(handle)
+            if ds is None and first_step and meta["step"] != first_step[0][1]["step"]:
+                flush_first_step()
+            
+            if ds is None:
+                first_step.append((handle, meta))
+            else:
+                write(handle, meta)
+        
+        if ds is None:
+            if not first_step:
+                raise RuntimeError(f"No GRIB messages found in {grib_path}")
+            # Single-step forecast
+            flush_first_step()
+        
+        if len(time_indices) != n_times:
+            raise RuntimeError(f"Converted {len(time_indices)} steps, expected {n_times}")
+    except Exception as e:
+        logger.error(f"Streaming NetCDF conversion failed: {e}")
+        raise SystemExit(1)
+    finally:
+        if ds is not None:
+            ds.close()
+
 
 class ECMWFAuroraAutomation:
     """Main automation class for ECMWF Open Data to Aurora workflow."""
     
     # Surface variables required by Aurora
-    SURFACE_VARS = ["2t", "2d", "10u", "10v", "msl", "tp", "sp", "tcwv"]
+    SURFACE_VARS = ("2t", "2d", "10u", "10v", "msl", "tp", "sp", "tcwv")
     
     # Pressure level variables and levels required by Aurora
-    PRESSURE_VARS = ["u", "v", "t", "q"]
-    PRESSURE_LEVELS = [1000, 925, 850, 700, 600, 500, 400, 300, 250, 200, 150, 100]  # Full Aurora levels
+    PRESSURE_VARS = ("u", "v", "t", "q")
+    PRESSURE_LEVELS = (1000, 925, 850, 700, 600, 500, 400, 300, 250, 200, 150, 100)  # Full Aurora levels
+    
+    # Aurora input fields as (param, pressure level) pairs; surface fields have no level
+    _REQUIRED_FIELDS = frozenset(itertools.product(PRESSURE_VARS, PRESSURE_LEVELS)) | frozenset(
+        (param, None) for param in SURFACE_VARS
+    )
+    
+    # Number of processes decoding GRIB messages during NetCDF conversion
+    CONVERSION_WORKERS = 8
+    
+    # NetCDF output packing: full precision, int16 scale/offset, or bfloat16 rounding
+    PACKING_MODES = ("fp32", "int16", "bf16")
     
     # IFS forecast cycles (UTC hours)
-    IFS_CYCLES = [0, 6, 12, 18]
+    IFS_CYCLES = (0, 6, 12, 18)
+    
+    # Before IFS cycle 50r1, the 06Z and 18Z runs were published under the "scda" stream
+    IFS_50R1_DATE = datetime(2026, 5, 12)
+    
+    # Number of concurrent cycle availability probes
+    PROBE_WORKERS = 8
+    
+    # ECMWF Open Data file server
+    OPEN_DATA_URL = "https://data.ecmwf.int/forecasts"
+    REQUEST_TIMEOUT = 5  # seconds
+    HTTP_POOL_SIZE = 16
+    
+    # How long a confirmed-available cycle is trusted without probing again
+    CYCLE_CACHE_TTL = 600  # seconds
     
-    def __init__(self, output_dir: str = "./data", lead_time: int = 72):
-        """Initialize automation with output directory and forecast lead time."""
+    # Number of concurrent byte-range downloads
+    DOWNLOAD_WORKERS = 8
+    DOWNLOAD_TIMEOUT = 60  # seconds
+    
+    def __init__(self, output_dir: str = "./data", lead_time: int = 72, packing: str = "fp32"):
+        """Initialize automation with output directory, forecast lead time and NetCDF packing."""
+        if packing not in self.PACKING_MODES:
+            raise ValueError(f"Unknown packing {packing!r}, expected one of {self.PACKING_MODES}")
+        
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.lead_time = lead_time
+        self.packing = packing
         self.client = Client()
         
+        # Pooled keep-alive connections for index lookups and range downloads
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=self.HTTP_POOL_SIZE,
+            pool_maxsize=self.HTTP_POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+        ))
+        
         # File paths
         self.sfc_file = self.output_dir / "ifs_sfc_latest.grib2"
         self.pl_file = self.output_dir / "ifs_pl_latest.grib2"
         self.init_file = self.output_dir / "init.grib2"
         self.aurora_output = self.output_dir / "aurora.grib"
         self.netcdf_output = self.output_dir / "aurora_forecast.nc"
+        
+        # Intermediate files written so far, removed by cleanup_intermediate_files
+        self._tempfiles: List[Path] = []
+        
+        # Cycles recently confirmed available, shared across runs in this output directory
+        self._cache_path = self.output_dir / ".cycle_cache.json"
+        self._cache_lock = threading.Lock()
+        self._cycle_cache = self._load_cycle_cache()
+    
+    def _register_tempfile(self, path: Path) -> Path:
+        """Record an intermediate file for later cleanup and return its path."""
+        if path not in self._tempfiles:
+            self._tempfiles.append(path)
+        return path
     
     def detect_latest_cycle(self) -> Tuple[datetime, int]:
         """
@@ -66,49 +516,102 @@ class ECMWFAuroraAutomation:
         """
         logger.info("Detecting latest available IFS cycle...")
         
-        now = datetime.utcnow()
+        # Naive UTC, as used for all cycle datetimes
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
         
-        # Check cycles in reverse chronological order
-        for hours_back in range(0, 48, 6):  # Check up to 48 hours back
-            check_time = now - timedelta(hours=hours_back)
-            
-            for cycle in reversed(self.IFS_CYCLES):
-                candidate_date = check_time.replace(hour=cycle, minute=0, second=0, microsecond=0)
-                
-                # Skip future times
-                if candidate_date > now:
-                    continue
-                
-                # Add delay for data availability (typically 3-4 hours after cycle time)
-                if now < candidate_date + timedelta(hours=4):
-                    continue
-                
-                if self._check_cycle_availability(candidate_date):
-                    logger.info(f"Latest available cycle: {candidate_date.strftime('%Y%m%d')} {cycle:02d}Z")
-                    return candidate_date, cycle
+        # Add delay for data availability (typically 3-4 hours after cycle time)
+        latest_ready = now - timedelta(hours=4)
+        
+        # Candidate cycles over the last 48 hours, newest first
+        cycle_hours = 24 // len(self.IFS_CYCLES)
+        latest_cycle = now.replace(hour=(now.hour // cycle_hours) * cycle_hours, minute=0, second=0, microsecond=0)
+        candidates = [
+            candidate_date
+            for candidate_date in (latest_cycle - timedelta(hours=cycle_hours * i) for i in range(48 // cycle_hours + 1))
+            if candidate_date <= latest_ready
+        ]
+        
+        # Probe all candidates concurrently, then take the newest available one
+        executor = ThreadPoolExecutor(max_workers=self.PROBE_WORKERS)
+        try:
+            futures = [executor.submit(self._check_cycle_availability, c) for c in candidates]
+            for candidate_date, future in zip(candidates, futures):
+                if future.result():
+                    logger.info(f"Latest available cycle: {candidate_date.strftime('%Y%m%d')} {candidate_date.hour:02d}Z")
+                    return candidate_date, candidate_date.hour
+        finally:
+            # Older candidates are no longer needed once a newer one is confirmed
+            executor.shutdown(wait=False, cancel_futures=True)
         
         raise RuntimeError("No available IFS cycles found in the last 48 hours")
     
+    def _open_data_url(self, cycle_datetime: datetime, step: int = 0) -> str:
+        """Build the Open Data URL of an IFS HRES forecast file, without extension."""
+        date_str = cycle_datetime.strftime("%Y%m%d")
+        hour_str = f"{cycle_datetime.hour:02d}"
+        if cycle_datetime.hour in (6, 18) and cycle_datetime < self.IFS_50R1_DATE:
+            stream = "scda"
+        else:
+            stream = "oper"
+        return (
+            f"{self.OPEN_DATA_URL}/{date_str}/{hour_str}z/ifs/0p25/{stream}/"
+            f"{date_str}{hour_str}0000-{step}h-{stream}-fc"
+        )
+    
+    def _load_cycle_cache(self) -> dict:
+        """Load cached cycle availability, dropping expired entries."""
+        try:
+            with open(self._cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+        
+        # Entries that are not timestamps are treated as expired
+        now = time.time()
+        return {
+            key: checked for key, checked in cache.items()
+            if isinstance(checked, (int, float)) and now - checked < self.CYCLE_CACHE_TTL
+        }
+    
+    def _save_cycle_cache(self):
+        """Atomically write the cycle availability cache."""
+        f = tempfile.NamedTemporaryFile("w", dir=self.output_dir, suffix=".tmp", delete=False)
+        try:
+            with f:
+                json.dump(self._cycle_cache, f)
+            os.replace(f.name, self._cache_path)
+        except BaseException:
+            # Don't leave partial cache files behind
+            os.unlink(f.name)
+            raise
+    
     def _check_cycle_availability(self, cycle_datetime: datetime) -> bool:
-        """Check if a specific cycle is available by testing a small download."""
+        """Check if a specific cycle is available by looking up its index file."""
+        key = cycle_datetime.strftime("%Y%m%d%H")
+        if key in self._cycle_cache:
+            return True
+        
         try:
-            # Test with a single surface variable
-            date_str = cycle_datetime.strftime("%Y%m%d")
-            hour_str = f"{cycle_datetime.hour:02d}"
-            
-            # Try to get a small surface field to test availability
-            self.client.retrieve(
-                date=date_str,
-                time=hour_str,
-                stream="oper",
-                type="fc",
-                step="0",
-                param="2t",
-                target=None  # Don't actually download
+            response = self.session.head(
+                self._open_data_url(cycle_datetime) + ".index",
+                timeout=self.REQUEST_TIMEOUT
             )
-            return True
-        except Exception:
+        except requests.RequestException:
             return False
+        
+        if response.status_code != 200:
+            return False
+        
+        # Probes run concurrently, so serialize cache updates
+        with self._cache_lock:
+            self._cycle_cache[key] = time.time()
+            try:
+                self._save_cycle_cache()
+            except OSError as e:
+                logger.warning(f"Could not write cycle cache {self._cache_path}: {e}")
+        return True
     
     def download_surface_data(self, date: datetime, cycle: int) -> bool:
         """
@@ -124,14 +627,15 @@ class ECMWFAuroraAutomation:
         logger.info(f"Downloading surface data for {date.strftime('%Y%m%d')} {cycle:02d}Z...")
         
         try:
-            self.client.retrieve(
+            # Client is not thread-safe; use a fresh one so downloads can run concurrently
+            Client().retrieve(
                 date=date.strftime("%Y%m%d"),
                 time=f"{cycle:02d}",
                 stream="oper",
                 type="fc",
                 step="0",  # Analysis step
                 param=self.SURFACE_VARS,
-                target=str(self.sfc_file)
+                target=str(self._register_tempfile(self.sfc_file))
             )
             logger.info(f"Surface data saved to {self.sfc_file}")
             return True
@@ -153,7 +657,8 @@ class ECMWFAuroraAutomation:
         logger.info(f"Downloading pressure level data for {date.strftime('%Y%m%d')} {cycle:02d}Z...")
         
         try:
-            self.client.retrieve(
+            # Client is not thread-safe; use a fresh one so downloads can run concurrently
+            Client().retrieve(
                 date=date.strftime("%Y%m%d"),
                 time=f"{cycle:02d}",
                 stream="oper",
@@ -161,7 +666,7 @@ class ECMWFAuroraAutomation:
                 step="0",  # Analysis step
                 param=self.PRESSURE_VARS,
                 levelist=self.PRESSURE_LEVELS,
-                target=str(self.pl_file)
+                target=str(self._register_tempfile(self.pl_file))
             )
             logger.info(f"Pressure level data saved to {self.pl_file}")
             return True
@@ -169,6 +674,165 @@ class ECMWFAuroraAutomation:
             logger.error(f"Failed to download pressure level data: {e}")
             return False
     
+    def download_combined(self, date: datetime, cycle: int) -> bool:
+        """
+        Download surface and pressure level variables in a single request.
+        
+        The Open Data client only keeps index entries that match every request
+        key, and surface entries have no levelist, so the request covers all
+        published pressure levels. Levels Aurora does not use are dropped
+        locally, and the result can be used directly as Aurora input without
+        concatenation.
+        
+        Args:
+            date: Forecast initialization date
+            cycle: Forecast cycle hour (0, 6, 12, 18)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        logger.info(f"Downloading initial conditions for {date.strftime('%Y%m%d')} {cycle:02d}Z...")
+        
+        combined_file = self._register_tempfile(self.output_dir / "ifs_combined_latest.grib2")
+        try:
+            self.client.retrieve(
+                date=date.strftime("%Y%m%d"),
+                time=f"{cycle:02d}",
+                stream="oper",
+                type="fc",
+                step="0",  # Analysis step
+                param=self.SURFACE_VARS + self.PRESSURE_VARS,
+                target=str(combined_file)
+            )
+            
+            found = set()
+            with open(combined_file, "rb") as infile, open(self._register_tempfile(self.init_file), "wb") as outfile:
+                while (handle := eccodes.codes_grib_new_from_file(infile)) is not None:
+                    try:
+                        key = self._field_key({
+                            "param": eccodes.codes_get(handle, "shortName"),
+                            "levtype": "pl" if eccodes.codes_get(handle, "typeOfLevel") == "isobaricInhPa" else "sfc",
+                            "levelist": eccodes.codes_get(handle, "level", int),
+                        })
+                        if key in self._REQUIRED_FIELDS and key not in found:
+                            found.add(key)
+                            outfile.write(eccodes.codes_get_message(handle))
+                    finally:
+                        eccodes.codes_release(handle)
+            
+            missing = self._REQUIRED_FIELDS - found
+            if missing:
+                logger.error(f"{len(missing)} of {len(self._REQUIRED_FIELDS)} required fields missing from combined download")
+                return False
+            
+            logger.info(f"Initial conditions saved to {self.init_file}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to download initial conditions: {e}")
+            return False
+    
+    def _field_key(self, entry: dict) -> Tuple[str, Optional[int]]:
+        """Return the (param, pressure level) key of an Open Data index entry, with no level for surface fields."""
+        if entry.get("levtype") == "pl":
+            return entry.get("param"), int(entry.get("levelist", -1))
+        return entry.get("param"), None
+    
+    def _fetch_range(self, url: str, offset: int, length: int) -> bytes:
+        """Download a single GRIB message from a byte range of a remote file."""
+        response = self.session.get(
+            url,
+            headers={"Range": f"bytes={offset}-{offset + length - 1}"},
+            timeout=self.DOWNLOAD_TIMEOUT
+        )
+        response.raise_for_status()
+        if len(response.content) != length:
+            raise IOError(f"Expected {length} bytes from {url}, got {len(response.content)}")
+        return response.content
+    
+    def download_ranges(self, date: datetime, cycle: int) -> bool:
+        """
+        Download only the required GRIB messages using the Open Data index file.
+        
+        Each required field is fetched with an HTTP range request and the
+        messages are written in index order to the init file.
+        
+        Args:
+            date: Forecast initialization date
+            cycle: Forecast cycle hour (0, 6, 12, 18)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        logger.info(f"Downloading initial condition fields for {date.strftime('%Y%m%d')} {cycle:02d}Z...")
+        
+        try:
+            url = self._open_data_url(date.replace(hour=cycle, minute=0, second=0, microsecond=0))
+            
+            response = self.session.get(url + ".index", timeout=self.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            
+            # Keep the first entry of each required field, in index order
+            ranges = {}
+            for line in response.text.splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    key = self._field_key(entry)
+                    if key in self._REQUIRED_FIELDS and key not in ranges:
+                        ranges[key] = (entry["_offset"], entry["_length"])
+            
+            missing = self._REQUIRED_FIELDS - ranges.keys()
+            if missing:
+                logger.error(f"{len(missing)} of {len(self._REQUIRED_FIELDS)} required fields not listed in {url}.index")
+                return False
+            
+            with ThreadPoolExecutor(max_workers=self.DOWNLOAD_WORKERS) as executor:
+                futures = [
+                    executor.submit(self._fetch_range, url + ".grib2", offset, length)
+                    for offset, length in ranges.values()
+                ]
+                with open(self._register_tempfile(self.init_file), "wb") as outfile:
+                    for future in futures:
+                        outfile.write(future.result())
+            
+            logger.info(f"Initial conditions ({len(ranges)} fields) saved to {self.init_file}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to download initial condition fields: {e}")
+            return False
+    
+    def download_initial_conditions(self, date: datetime, cycle: int) -> bool:
+        """
+        Download Aurora initial conditions to the init file.
+        
+        Tries byte-range downloads of the required fields first, then a single
+        combined request, and finally concurrent surface and pressure level
+        downloads followed by concatenation.
+        
+        Args:
+            date: Forecast initialization date
+            cycle: Forecast cycle hour (0, 6, 12, 18)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if self.download_ranges(date, cycle):
+            return True
+        
+        logger.warning("Byte-range download failed, falling back to ECMWF Open Data client")
+        if self.download_combined(date, cycle):
+            return True
+        
+        logger.warning("Combined download failed, downloading surface and pressure level data separately")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.download_surface_data, date, cycle),
+                executor.submit(self.download_pressure_level_data, date, cycle),
+            ]
+            if not all([future.result() for future in futures]):
+                return False
+        
+        return self.concatenate_grib_files()
+    
     def concatenate_grib_files(self) -> bool:
         """
         Concatenate surface and pressure level GRIB files for Aurora input.
@@ -179,15 +843,15 @@ class ECMWFAuroraAutomation:
         logger.info("Concatenating GRIB files for Aurora input...")
         
         try:
-            # Use cat command to concatenate GRIB files
-            cmd = ["cat", str(self.sfc_file), str(self.pl_file)]
-            
-            with open(self.init_file, "wb") as outfile:
-                result = subprocess.run(cmd, stdout=outfile, stderr=subprocess.PIPE)
+            with open(self._register_tempfile(self.init_file), "wb") as outfile:
+                for file_path in (self.sfc_file, self.pl_file):
+                    with open(file_path, "rb") as infile:
+                        _append_file(infile, outfile)
             
-            if result.returncode != 0:
-                logger.error(f"GRIB concatenation failed: {result.stderr.decode()}")
-                return False
+            # Aurora fetches its own input, so nothing rereads the output soon;
+            # drop it from the page cache (Linux starts writeback of dirty pages)
+            with open(self.init_file, "rb") as f:
+                _fadvise(f, "POSIX_FADV_DONTNEED")
             
             logger.info(f"Concatenated GRIB file saved to {self.init_file}")
             return True
@@ -214,22 +878,91 @@ class ECMWFAuroraAutomation:
                 "--path", str(self.aurora_output)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Stream output line by line rather than buffering it until exit
+            with subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=1,
+                text=True
+            ) as process:
+                for line in process.stdout:
+                    logger.info(f"Aurora: {line.rstrip()}")
+                returncode = process.wait()
             
-            if result.returncode != 0:
-                logger.error(f"Aurora forecast failed: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"Aurora forecast failed with exit code {returncode}")
                 return False
             
             logger.info(f"Aurora forecast completed. Output saved to {self.aurora_output}")
-            logger.info(f"Aurora stdout: {result.stdout}")
             return True
         except Exception as e:
             logger.error(f"Failed to run Aurora forecast: {e}")
             return False
     
+    def _netcdf_attributes(self) -> dict:
+        """Global attributes for the NetCDF output."""
+        return {
+            "title": "Aurora Weather Forecast",
+            "source": "ECMWF IFS initial conditions",
+            "model": "Microsoft Aurora",
+            "institution": "Arizona State University",
+            "created": datetime.now(timezone.utc).isoformat()
+        }
+    
+    def start_netcdf_conversion(self) -> Tuple[multiprocessing.Process, multiprocessing.Event]:
+        """
+        Start converting Aurora output to NetCDF in a background process.
+        
+        The process follows the Aurora GRIB file as it is written, so the
+        conversion overlaps with inference. Call ``finish_netcdf_conversion``
+        once the forecast has finished.
+        
+        Returns:
+            Tuple of (process, done event)
+        """
+        logger.info("Starting background NetCDF conversion...")
+        
+        # Don't pick up output from a previous run
+        if self.aurora_output.exists():
+            self.aurora_output.unlink()
+        
+        # Aurora writes the input fields at step 0, then one step every 6 hours up to the lead time
+        done = multiprocessing.Event()
+        process = multiprocessing.Process(
+            target=_stream_to_netcdf,
+            args=(self.aurora_output, self.netcdf_output, self.packing, self._netcdf_attributes(),
+                  self.lead_time // 6 + 1, done),
+            name="netcdf-conversion"
+        )
+        process.start()
+        return process, done
+    
+    def finish_netcdf_conversion(self, process: multiprocessing.Process,
+                                 done: multiprocessing.Event) -> bool:
+        """
+        Wait for the background NetCDF conversion to write the remaining messages.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        done.set()
+        process.join()
+        
+        if process.exitcode != 0:
+            logger.error(f"Background NetCDF conversion failed with exit code {process.exitcode}")
+            return False
+        
+        logger.info(f"NetCDF output saved to {self.netcdf_output}")
+        return True
+    
     def convert_to_netcdf(self) -> bool:
         """
-        Convert Aurora GRIB output to NetCDF using cfgrib/xarray.
+        Convert Aurora GRIB output to NetCDF using eccodes/netCDF4.
+        
+        Messages are decoded in parallel worker processes, one (variable, step)
+        block at a time, and written into a pre-created NetCDF file, so the
+        forecast is never loaded into memory as a whole.
         
         Returns:
             True if successful, False otherwise
@@ -237,37 +970,73 @@ class ECMWFAuroraAutomation:
         logger.info("Converting Aurora output to NetCDF...")
         
         try:
-            # Use cfgrib backend to read GRIB data
-            ds = xr.open_dataset(
-                self.aurora_output,
-                engine="cfgrib",
-                backend_kwargs={
-                    "filter_by_keys": {},
-                    "read_keys": ["paramId", "cfName", "cfVarName", "units"]
-                }
+            # First pass: headers only (plus field ranges for int16 packing)
+            grid, variables, levels, steps, messages = _scan_grib_fields(
+                self.aurora_output, with_range=self.packing == "int16"
             )
             
-            # Add metadata
-            ds.attrs.update({
-                "title": "Aurora Weather Forecast",
-                "source": "ECMWF IFS initial conditions",
-                "model": "Microsoft Aurora",
-                "institution": "Arizona State University",
-                "created": datetime.utcnow().isoformat()
-            })
+            # Fill values are not written, so every slot needs exactly one message
+            n_pressure = sum(meta["pressure"] for meta in variables.values())
+            expected = (len(variables) - n_pressure + n_pressure * len(levels)) * len(steps)
+            slots = {(meta["name"], meta["step"], meta["level"] if meta["pressure"] else None) for meta in messages}
+            if len(messages) != expected or len(slots) != expected:
+                raise RuntimeError(
+                    f"Found {len(messages)} GRIB messages for {len(slots)} of {expected} fields in {self.aurora_output}"
+                )
             
-            # Save to NetCDF
-            ds.to_netcdf(
-                self.netcdf_output,
-                format="NETCDF4",
-                engine="netcdf4"
-            )
+            # Group messages into one (variable, step) block per decode task
+            time_indices = {step: i for i, step in enumerate(steps)}
+            level_indices = {level: i for i, level in enumerate(levels)}
+            blocks = {}
+            for meta in messages:
+                blocks.setdefault((meta["name"], time_indices[meta["step"]]), []).append(meta)
+            shape = (len(grid["latitudes"]), len(grid["longitudes"]))
             
-            logger.info(f"NetCDF output saved to {self.netcdf_output}")
-            logger.info(f"Variables: {list(ds.data_vars.keys())}")
-            logger.info(f"Dimensions: {dict(ds.dims)}")
+            # Decoding is CPU-bound and runs in parallel; a single handle writes,
+            # as HDF5 does not support concurrent writers to one file. With one
+            # CPU, decode in a thread to avoid shipping arrays between processes.
+            cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+            workers = min(self.CONVERSION_WORKERS, cpus)
+            executor_class = ProcessPoolExecutor if workers > 1 else ThreadPoolExecutor
+            with executor_class(max_workers=workers) as executor:
+                ds = _create_netcdf(
+                    self.netcdf_output, grid, variables, levels, self.packing,
+                    self._netcdf_attributes(), n_times=len(steps)
+                )
+                try:
+                    ds["time"][:] = steps
+                    
+                    pending = {}
+                    
+                    def write_completed(futures):
+                        for future in futures:
+                            (name, time_index), block = pending.pop(future), future.result()
+                            if variables[name]["pressure"]:
+                                rows = [level_indices[meta["level"]] for meta in blocks[(name, time_index)]]
+                                ds[name][time_index, rows, :, :] = block
+                            else:
+                                ds[name][time_index, :, :] = block[0]
+                    
+                    for key, block_messages in blocks.items():
+                        # Bound the number of decoded blocks held in memory
+                        if len(pending) >= 2 * workers:
+                            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            write_completed(completed)
+                        offsets = [meta["offset"] for meta in block_messages]
+                        future = executor.submit(_decode_fields, self.aurora_output, offsets, shape, self.packing)
+                        pending[future] = key
+                    write_completed(list(pending))
+                finally:
+                    ds.close()
             
-            ds.close()
+            # Done with the GRIB output; drop it from the page cache
+            with open(self.aurora_output, "rb") as f:
+                _fadvise(f, "POSIX_FADV_DONTNEED")
+            
+            logger.info(f"NetCDF output saved to {self.netcdf_output}")
+            logger.info(f"Variables: {list(variables)}")
+            logger.info(f"Dimensions: time={len(steps)}, level={len(levels)}, "
+                        f"latitude={len(grid['latitudes'])}, longitude={len(grid['longitudes'])}")
             return True
         except Exception as e:
             logger.error(f"Failed to convert to NetCDF: {e}")
@@ -277,10 +1046,13 @@ class ECMWFAuroraAutomation:
         """Remove intermediate GRIB files to save space."""
         logger.info("Cleaning up intermediate files...")
         
-        for file_path in [self.sfc_file, self.pl_file, self.init_file]:
-            if file_path.exists():
+        for file_path in self._tempfiles:
+            try:
                 file_path.unlink()
-                logger.info(f"Removed {file_path}")
+            except FileNotFoundError:
+                continue
+            logger.info(f"Removed {file_path}")
+        self._tempfiles.clear()
     
     def run_complete_workflow(self) -> bool:
         """
@@ -295,12 +1067,24 @@ class ECMWFAuroraAutomation:
             # Use ECMWF's recommended approach: let Aurora handle data download automatically
             logger.info("Using ai-models aurora with ECMWF Open Data integration")
             
+            # int16 packing needs the full range of each field, so it can only
+            # be converted after the forecast; otherwise overlap with inference
+            converter = None
+            if self.packing != "int16":
+                converter = self.start_netcdf_conversion()
+            
             # Step 1: Run Aurora forecast (handles data download internally)
             if not self.run_aurora_forecast():
+                if converter is not None:
+                    converter[0].terminate()
+                    converter[0].join()
                 return False
             
             # Step 2: Convert to NetCDF for analysis
-            if not self.convert_to_netcdf():
+            if converter is not None:
+                if not self.finish_netcdf_conversion(*converter):
+                    return False
+            elif not self.convert_to_netcdf():
                 return False
             
             logger.info("Workflow completed successfully!")
@@ -333,13 +1117,20 @@ def main():
         action="store_true",
         help="Keep intermediate GRIB files"
     )
+    parser.add_argument(
+        "--packing",
+        choices=ECMWFAuroraAutomation.PACKING_MODES,
+        default="fp32",
+        help="NetCDF output precision: fp32, int16 scale/offset or bf16 rounding (default: fp32)"
+    )
     
     args = parser.parse_args()
     
     # Create automation instance
     automation = ECMWFAuroraAutomation(
         output_dir=args.output_dir,
-        lead_time=args.lead_time
+        lead_time=args.lead_time,
+        packing=args.packing
     )
     
     # Override cleanup if requested
@@ -21,14 +21,13 @@ echo "Installing Python dependencies..."
 pip install --user -r scripts/requirements.txt
 
 # Option 2: If using conda/mamba (uncomment if preferred)
-# conda install -c conda-forge ecmwf-opendata xarray cfgrib netcdf4 numpy pandas scipy eccodes tqdm psutil
+# conda install -c conda-forge ecmwf-opendata requests xarray cfgrib netcdf4 numpy pandas scipy eccodes tqdm psutil
 
 echo "Verifying installations..."
 
 # Check critical dependencies
 python -c "import ecmwf.opendata; print('✓ ecmwf-opendata installed')"
-python -c "import xarray; print('✓ xarray installed')"
-python -c "import cfgrib; print('✓ cfgrib installed')"
+python -c "import eccodes; print('✓ eccodes installed')"
 python -c "import netCDF4; print('✓ netCDF4 installed')"
 
 # Check if ai-models and Aurora are available
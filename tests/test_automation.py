@@ -0,0 +1,481 @@
+"""Tests for the ECMWF Open Data to Aurora automation script."""
+
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+eccodes = pytest.importorskip("eccodes")
+netCDF4 = pytest.importorskip("netCDF4")
+requests = pytest.importorskip("requests")
+pytest.importorskip("ecmwf.opendata")
+
+# The automation script is not part of the package
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+import ecmwf_aurora_automation as automation  # noqa: E402
+
+STEPS = (0, 6, 12)
+LEVELS = (850, 500)
+FIELDS = [("msl", "meanSea", 0), ("2t", "heightAboveGround", 2)] + [("t", "isobaricInhPa", level) for level in LEVELS]
+NX, NY = 8, 5
+
+# Level type and level of the Aurora surface input fields
+SURFACE_LEVELS = {
+    "2t": ("heightAboveGround", 2),
+    "2d": ("heightAboveGround", 2),
+    "10u": ("heightAboveGround", 10),
+    "10v": ("heightAboveGround", 10),
+    "msl": ("meanSea", 0),
+    "tp": ("surface", 0),
+    "sp": ("surface", 0),
+    "tcwv": ("entireAtmosphere", 0),
+}
+
+# Open Data publishes one more pressure level than Aurora uses
+OPEN_DATA_LEVELS = (1000, 925, 850, 700, 600, 500, 400, 300, 250, 200, 150, 100, 50)
+
+
+def write_grib(path, steps=STEPS):
+    """Write a small Aurora-like GRIB file; the last latitude row is missing, as with nan_extend."""
+    rng = np.random.default_rng(0)
+    with open(path, "wb") as f:
+        for step in steps:
+            for short_name, type_of_level, level in FIELDS:
+                handle = eccodes.codes_grib_new_from_samples("regular_ll_pl_grib2")
+                eccodes.codes_set_key_vals(
+                    handle,
+                    {
+                        "Ni": NX,
+                        "Nj": NY,
+                        "latitudeOfFirstGridPointInDegrees": 90.0,
+                        "latitudeOfLastGridPointInDegrees": -90.0,
+                        "longitudeOfFirstGridPointInDegrees": 0.0,
+                        "longitudeOfLastGridPointInDegrees": 315.0,
+                        "iDirectionIncrementInDegrees": 45.0,
+                        "jDirectionIncrementInDegrees": 45.0,
+                        "dataDate": 20241201,
+                        "dataTime": 0,
+                    },
+                )
+                eccodes.codes_set(handle, "typeOfLevel", type_of_level)
+                eccodes.codes_set(handle, "level", level)
+                eccodes.codes_set(handle, "shortName", short_name)
+                eccodes.codes_set(handle, "step", step)
+                eccodes.codes_set(handle, "bitmapPresent", 1)
+
+                base = 101000.0 if short_name == "msl" else 250.0
+                values = base + step + rng.random(NX * NY) * 50
+                values[-NX:] = eccodes.codes_get(handle, "missingValue")
+                eccodes.codes_set_values(handle, values)
+                eccodes.codes_write(handle, f)
+                eccodes.codes_release(handle)
+
+
+def read_grib(path):
+    """Decode a GRIB file into {(cfVarName, step, level): values} with missing points as NaN."""
+    fields = {}
+    with open(path, "rb") as f:
+        while (handle := eccodes.codes_grib_new_from_file(f)) is not None:
+            values = eccodes.codes_get_values(handle)
+            values[values == eccodes.codes_get(handle, "missingValue")] = np.nan
+            key = (
+                eccodes.codes_get(handle, "cfVarName"),
+                eccodes.codes_get(handle, "step", int),
+                eccodes.codes_get(handle, "level", int),
+            )
+            fields[key] = values.reshape(NY, NX)
+            eccodes.codes_release(handle)
+    return fields
+
+
+def write_open_data(path, surface_vars=tuple(SURFACE_LEVELS)):
+    """Write a synthetic Open Data step 0 file and return its index entries."""
+    fields = [(param, *SURFACE_LEVELS[param]) for param in surface_vars] + [
+        (param, "isobaricInhPa", level) for param in ("u", "v", "t", "q") for level in OPEN_DATA_LEVELS
+    ]
+    entries = []
+    with open(path, "wb") as f:
+        for short_name, type_of_level, level in fields:
+            handle = eccodes.codes_grib_new_from_samples("regular_ll_pl_grib2")
+            if short_name == "tp":
+                # Accumulations need a statistical product template
+                eccodes.codes_set(handle, "productDefinitionTemplateNumber", 8)
+            eccodes.codes_set(handle, "typeOfLevel", type_of_level)
+            eccodes.codes_set(handle, "level", level)
+            eccodes.codes_set(handle, "shortName", short_name)
+
+            entry = {"type": "fc", "step": "0", "param": short_name, "_offset": f.tell()}
+            if type_of_level == "isobaricInhPa":
+                entry.update(levtype="pl", levelist=str(level))
+            else:
+                entry["levtype"] = "sfc"
+            eccodes.codes_write(handle, f)
+            entry["_length"] = f.tell() - entry["_offset"]
+            entries.append(entry)
+            eccodes.codes_release(handle)
+    return entries
+
+
+def read_fields(path):
+    """Read the (param, pressure level) keys of a GRIB file, in file order."""
+    keys = []
+    with open(path, "rb") as f:
+        while (handle := eccodes.codes_grib_new_from_file(f)) is not None:
+            pressure = eccodes.codes_get(handle, "typeOfLevel") == "isobaricInhPa"
+            keys.append(
+                (eccodes.codes_get(handle, "shortName"), eccodes.codes_get(handle, "level", int) if pressure else None)
+            )
+            eccodes.codes_release(handle)
+    return keys
+
+
+class FakeResponse:
+    """Minimal stand-in for a requests.Response."""
+
+    def __init__(self, content=b"", status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def iter_lines(self):
+        return iter(self.content.splitlines())
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+def index_response(entries):
+    """Build an Open Data index file response from index entries."""
+    return FakeResponse("\n".join(json.dumps(entry) for entry in entries).encode())
+
+
+def check_netcdf(nc_path, grib_path, packing):
+    """Compare a converted NetCDF file with its source GRIB."""
+    with netCDF4.Dataset(nc_path) as ds:
+        assert list(ds["time"][:]) == list(STEPS)
+        assert list(ds["level"][:]) == list(LEVELS)
+        assert ds["time"].units == "hours since 2024-12-01 00:00:00"
+
+        levels = list(ds["level"][:])
+        for (name, step, level), expected in read_grib(grib_path).items():
+            var = ds[name]
+            index = (STEPS.index(step), levels.index(level)) if var.ndim == 4 else (STEPS.index(step),)
+            actual = np.ma.filled(np.ma.asarray(var[index], dtype=np.float64), np.nan)
+
+            # Missing points must not come through as missingValue or packed numbers
+            assert np.array_equal(np.isnan(actual), np.isnan(expected)), name
+
+            valid = ~np.isnan(expected)
+            if packing == "int16":
+                # Unpacked in float32, so allow for its rounding too
+                tolerance = var.scale_factor + np.abs(expected[valid]) * 2.0**-23
+            elif packing == "bf16":
+                tolerance = np.abs(expected[valid]) * 2.0**-8
+            else:
+                tolerance = np.abs(expected[valid]) * 1e-6
+            assert np.all(np.abs(actual[valid] - expected[valid]) <= tolerance), name
+
+
+@pytest.fixture
+def aurora_grib(tmp_path):
+    """Path to a synthetic Aurora GRIB output file."""
+    path = tmp_path / "aurora.grib"
+    write_grib(path)
+    return path
+
+
+def test_round_to_bfloat16():
+    """Test that values are rounded to bfloat16 precision."""
+    values = np.array([1.0, 3.14159, -250.123, 101325.0, np.nan], dtype=np.float32)
+    rounded = automation._round_to_bfloat16(values)
+
+    assert rounded.dtype == np.float32
+    assert np.all(rounded.view(np.uint32)[:-1] & 0xFFFF == 0)
+    assert np.allclose(rounded[:-1], values[:-1], rtol=2.0**-8)
+    assert np.isnan(rounded[-1])
+
+
+def test_int16_packing():
+    """Test that the int16 encoding maps the field range onto [-32767, 32767]."""
+    encoding = automation._int16_packing(200.0, 330.0)
+
+    assert set(encoding) == {"scale_factor", "add_offset", "_FillValue"}
+
+    def pack(value):
+        return round((value - encoding["add_offset"]) / encoding["scale_factor"])
+
+    assert pack(200.0) == -32767
+    assert pack(330.0) == 32767
+
+    # Constant fields still get a usable scale
+    assert automation._int16_packing(5.0, 5.0)["scale_factor"] == 1.0
+
+
+@pytest.mark.parametrize("packing", ["fp32", "int16", "bf16"])
+def test_convert_to_netcdf(tmp_path, aurora_grib, packing):
+    """Test GRIB to NetCDF conversion round trip, including missing points."""
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path / "out", lead_time=12, packing=packing)
+    runner.aurora_output = aurora_grib
+
+    assert runner.convert_to_netcdf()
+    check_netcdf(runner.netcdf_output, aurora_grib, packing)
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+@pytest.mark.parametrize("packing", ["fp32", "int16", "bf16"])
+def test_convert_to_netcdf_process_pool(tmp_path, aurora_grib, monkeypatch, packing):
+    """Test conversion with blocks decoded in worker processes and pickled back."""
+    monkeypatch.setattr(automation.os, "sched_getaffinity", lambda pid: {0, 1, 2, 3}, raising=False)
+
+    pools = []
+
+    class RecordingProcessPoolExecutor(automation.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(kwargs)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(automation, "ProcessPoolExecutor", RecordingProcessPoolExecutor)
+
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path / "out", lead_time=12, packing=packing)
+    runner.aurora_output = aurora_grib
+
+    assert runner.convert_to_netcdf()
+    assert pools == [{"max_workers": 4}]
+    check_netcdf(runner.netcdf_output, aurora_grib, packing)
+
+
+@pytest.mark.parametrize("packing", ["fp32", "bf16"])
+def test_stream_to_netcdf(tmp_path, aurora_grib, packing):
+    """Test the streaming converter on a completely written GRIB file."""
+    nc_path = tmp_path / "stream.nc"
+    done = threading.Event()
+    done.set()
+
+    automation._stream_to_netcdf(aurora_grib, nc_path, packing, {"title": "test"}, len(STEPS), done)
+    check_netcdf(nc_path, aurora_grib, packing)
+
+
+def test_detect_latest_cycle(tmp_path, monkeypatch):
+    """Test that candidate cycles are unique, newest first and at least 4 hours old."""
+
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2024, 12, 1, 9, 30, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(automation, "datetime", FixedDatetime)
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path)
+
+    probed = []
+
+    def check(cycle_datetime):
+        probed.append(cycle_datetime)
+        return cycle_datetime == datetime(2024, 11, 30, 18)
+
+    monkeypatch.setattr(runner, "_check_cycle_availability", check)
+
+    assert runner.detect_latest_cycle() == (datetime(2024, 11, 30, 18), 18)
+    # 06Z is not yet 4 hours old, so 00Z is the newest candidate
+    assert max(probed) == datetime(2024, 12, 1, 0)
+    assert len(probed) == len(set(probed))
+    assert all(c.hour in runner.IFS_CYCLES for c in probed)
+
+
+@pytest.mark.parametrize("contents", ["[1, 2]", '"stale"', '{"a": "b", "c": null}', "{"])
+def test_load_cycle_cache_invalid(tmp_path, contents):
+    """Test that a malformed cycle cache is ignored rather than raising."""
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path)
+    runner._cache_path.write_text(contents)
+
+    assert runner._load_cycle_cache() == {}
+
+
+@pytest.mark.parametrize("age, probed", [(0, False), (automation.ECMWFAuroraAutomation.CYCLE_CACHE_TTL + 1, True)])
+def test_cycle_cache(tmp_path, monkeypatch, age, probed):
+    """Test that fresh cache entries skip the probe and expired ones are probed and refreshed."""
+    cycle = datetime(2026, 10, 14, 6)
+    (tmp_path / ".cycle_cache.json").write_text(json.dumps({"2026101406": time.time() - age}))
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path)
+
+    heads = []
+
+    def head(url, timeout=None):
+        heads.append(url)
+        return FakeResponse()
+
+    monkeypatch.setattr(runner.session, "head", head)
+
+    assert runner._check_cycle_availability(cycle)
+    assert heads == ([runner._open_data_url(cycle) + ".index"] if probed else [])
+
+    # Probed cycles are written back with a new timestamp
+    cache = json.loads(runner._cache_path.read_text())
+    assert time.time() - cache["2026101406"] < runner.CYCLE_CACHE_TTL
+
+
+@pytest.mark.parametrize("failure", ["dump", "replace"])
+def test_save_cycle_cache_failure(tmp_path, monkeypatch, failure):
+    """Test that a failed cache write leaves no temporary file behind."""
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path)
+    if failure == "dump":
+        # Not JSON serializable
+        runner._cycle_cache["2026101406"] = object()
+    else:
+
+        def replace(src, dst):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(automation.os, "replace", replace)
+
+    with pytest.raises((OSError, TypeError)):
+        runner._save_cycle_cache()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stream_to_netcdf_missing_steps(tmp_path):
+    """Test that the streaming converter fails when the forecast stops early."""
+    grib_path = tmp_path / "aurora.grib"
+    write_grib(grib_path, steps=STEPS[:2])
+    done = threading.Event()
+    done.set()
+
+    with pytest.raises(SystemExit):
+        automation._stream_to_netcdf(grib_path, tmp_path / "stream.nc", "fp32", {}, len(STEPS), done)
+
+
+@pytest.mark.parametrize("duplicate", [False, True])
+def test_convert_to_netcdf_missing_field(tmp_path, aurora_grib, duplicate):
+    """Test that conversion fails when a field has no message, even if another is duplicated."""
+    messages = []
+    with open(aurora_grib, "rb") as f:
+        while (handle := eccodes.codes_grib_new_from_file(f)) is not None:
+            messages.append(eccodes.codes_get_message(handle))
+            eccodes.codes_release(handle)
+
+    # Drop a pressure level field from the middle step
+    del messages[len(FIELDS) + 3]
+    if duplicate:
+        messages.append(messages[0])
+    grib_path = tmp_path / "incomplete.grib"
+    grib_path.write_bytes(b"".join(messages))
+
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path / "out", lead_time=12, packing="int16")
+    runner.aurora_output = grib_path
+
+    assert not runner.convert_to_netcdf()
+
+
+@pytest.mark.parametrize("surface_vars", [tuple(SURFACE_LEVELS), tuple(SURFACE_LEVELS)[1:]])
+def test_download_combined(tmp_path, monkeypatch, surface_vars):
+    """Test that the combined download keeps surface fields and fails when one is not published."""
+    source = tmp_path / "source.grib2"
+    entries = write_open_data(source, surface_vars)
+    data = source.read_bytes()
+
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path / "out")
+    monkeypatch.setattr(runner.client.session, "get", lambda url, **kwargs: index_response(entries))
+
+    def download(result):
+        # The client's index filtering has picked the byte ranges to fetch
+        with open(result.target, "wb") as f:
+            for _, parts in result.urls:
+                for offset, length in parts:
+                    f.write(data[offset : offset + length])
+        return result
+
+    monkeypatch.setattr(runner.client, "_download", download)
+
+    complete = surface_vars == tuple(SURFACE_LEVELS)
+    assert runner.download_combined(datetime(2026, 10, 14), 0) == complete
+    if complete:
+        fields = read_fields(runner.init_file)
+        assert len(fields) == len(set(fields))
+        assert set(fields) == runner._REQUIRED_FIELDS
+
+
+@pytest.mark.parametrize(
+    "cycle, stream",
+    [
+        (datetime(2026, 10, 14, 0), "oper"),
+        (datetime(2026, 10, 14, 6), "oper"),
+        (datetime(2026, 5, 12, 18), "oper"),
+        (datetime(2026, 5, 11, 18), "scda"),
+        (datetime(2024, 12, 1, 6), "scda"),
+        (datetime(2024, 12, 1, 12), "oper"),
+    ],
+)
+def test_open_data_url(tmp_path, cycle, stream):
+    """Test that 06Z and 18Z runs use the "scda" stream only before IFS cycle 50r1."""
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path)
+    url = runner._open_data_url(cycle)
+
+    date = f"{cycle:%Y%m%d}"
+    assert url == (
+        f"https://data.ecmwf.int/forecasts/{date}/{cycle:%H}z/ifs/0p25/{stream}/" f"{date}{cycle:%H}0000-0h-{stream}-fc"
+    )
+
+    # Matches the URL the Open Data client builds for the same request
+    result = runner.client._get_urls(date=date, time=cycle.hour, stream="oper", type="fc", step=0, param="2t")
+    assert result.urls == [url + ".grib2"]
+
+
+def fake_open_data_session(entries, data):
+    """Return a session ``get`` serving an index file and byte ranges of ``data``."""
+
+    def get(url, headers=None, timeout=None):
+        if url.endswith(".index"):
+            return index_response(entries)
+        assert url.endswith(".grib2")
+        start, end = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+        # Answer later ranges first, so out-of-order completion would show
+        time.sleep(0.01 * (len(data) - start) / len(data))
+        return FakeResponse(data[start : end + 1], status_code=206)
+
+    return get
+
+
+def test_download_ranges(tmp_path, monkeypatch):
+    """Test that only the required fields are downloaded, in index order."""
+    source = tmp_path / "source.grib2"
+    entries = write_open_data(source)
+    data = source.read_bytes()
+
+    # Duplicated index entries are only downloaded once
+    entries.append(dict(entries[0]))
+
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path / "out")
+    monkeypatch.setattr(runner.session, "get", fake_open_data_session(entries, data))
+
+    assert runner.download_ranges(datetime(2026, 10, 14), 6)
+
+    expected = [runner._field_key(entry) for entry in entries[:-1]]
+    expected = [key for key in expected if key in runner._REQUIRED_FIELDS]
+    assert read_fields(runner.init_file) == expected
+    assert set(expected) == runner._REQUIRED_FIELDS
+
+
+def test_download_ranges_missing_field(tmp_path, monkeypatch):
+    """Test that an index listing one field twice but missing another fails the download."""
+    source = tmp_path / "source.grib2"
+    entries = write_open_data(source)
+    data = source.read_bytes()
+
+    # Same number of required entries as a complete index
+    entries = [entry for entry in entries if entry["param"] != "msl"] + [dict(entries[0])]
+
+    runner = automation.ECMWFAuroraAutomation(output_dir=tmp_path / "out")
+    monkeypatch.setattr(runner.session, "get", fake_open_data_session(entries, data))
+
+    assert not runner.download_ranges(datetime(2026, 10, 14), 6)